@@ -16,6 +16,7 @@ from common.types import (
     AgentSkill,
     MissingAPIKeyError,
 )
+from common.utils.lazy_agent import LazyAgent
 from dotenv import load_dotenv
 from task_manager import AgentTaskManager
 
@@ -26,45 +27,52 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+CAPABILITIES = AgentCapabilities(streaming=False)
+SKILL = AgentSkill(
+    id='content_generator',
+    name='Content Generator',
+    description=(
+        'A collaborative crew of AI agents that work together to plan,'
+        ' write, and edit high-quality content based on your prompt.'
+    ),
+    tags=['generate content', 'planning', 'writing', 'editing'],
+    examples=[
+        'Write an article about AI and its impact on society',
+        'Create technical documentation for a new feature',
+        'Generate a blog post about machine learning'
+    ],
+)
+# The url is filled in by main() once host and port are known
+AGENT_CARD = AgentCard(
+    name='Content Generation Crew',
+    description=(
+        'A specialized team of AI agents that collaborate to create'
+        ' high-quality content through planning, writing, and editing.'
+    ),
+    url='',
+    version='1.0.0',
+    defaultInputModes=ContentGenerationCrew.SUPPORTED_CONTENT_TYPES,
+    defaultOutputModes=ContentGenerationCrew.SUPPORTED_CONTENT_TYPES,
+    capabilities=CAPABILITIES,
+    skills=[SKILL],
+)
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10001)
 def main(host, port):
     """Entry point for the A2A + CrewAI Content generation sample."""
     try:
-        capabilities = AgentCapabilities(streaming=False)
-        skill = AgentSkill(
-            id='content_generator',
-            name='Content Generator',
-            description=(
-                'A collaborative crew of AI agents that work together to plan,'
-                ' write, and edit high-quality content based on your prompt.'
-            ),
-            tags=['generate content', 'planning', 'writing', 'editing'],
-            examples=[
-                'Write an article about AI and its impact on society',
-                'Create technical documentation for a new feature',
-                'Generate a blog post about machine learning'
-            ],
-        )
-
-        agent_card = AgentCard(
-            name='Content Generation Crew',
-            description=(
-                'A specialized team of AI agents that collaborate to create'
-                ' high-quality content through planning, writing, and editing.'
-            ),
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            defaultInputModes=ContentGenerationCrew.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=ContentGenerationCrew.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
+        agent_card = AGENT_CARD.model_copy(
+            update={'url': f'http://{host}:{port}/'}
         )
 
         server = A2AServer(
             agent_card=agent_card,
-            task_manager=AgentTaskManager(agent=ContentGenerationCrew()),
+            task_manager=AgentTaskManager(
+                agent=LazyAgent(ContentGenerationCrew)
+            ),
             host=host,
             port=port,
         )
@@ -3,13 +3,19 @@
 Handles the agents and also presents the tools required.
 """
 
+import asyncio
 from collections.abc import AsyncIterable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from crewai import LLM, Agent, Crew, Task
 from crewai import Process
 from dotenv import load_dotenv
+import json
 import logging
-from datetime import datetime
+import os
+import re
+
+from response_cache import ExactCache, SemanticCache
 
 load_dotenv()
 
@@ -20,6 +26,40 @@ logging.basicConfig(
     format='%(message)s'  # Clean format for demo purposes
 )
 
+# Verbose agents and per-task output files slow every run down, so they are
+# only enabled on request
+VERBOSE = os.getenv("CREW_VERBOSE") == "1"
+
+# Crew runs block for seconds, so they get a bounded pool of their own and
+# cannot starve the default executor used by the server
+_CREW_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="crew")
+
+# Identical prompts are answered from here before any LLM is involved
+_EXACT_CACHE = ExactCache(
+    maxsize=512,
+    db_path=(
+        "~/.cache/a2a/exact.sqlite"
+        if os.getenv("EXACT_CACHE_PERSIST") == "1"
+        else None
+    ),
+)
+
+# Single-call alternative to the planner -> writer -> editor pipeline
+UNIFIED_PROMPT = (
+    "You are a content team made of a planner, a writer and an editor.\n"
+    "1. Plan: create a detailed outline with main sections and key points.\n"
+    "2. Write: turn the outline into a comprehensive response with clear"
+    " language and examples where appropriate.\n"
+    "3. Edit: polish the draft for clarity, coherence and grammar.\n"
+    "Reply with a single JSON object with the string keys"
+    " \"outline\", \"draft\" and \"final\", and nothing else.\n\n"
+    "User prompt: "
+)
+# The user prompt always comes last, so the static instructions before it
+# form a stable prefix that Ollama can keep in its KV cache between runs
+USER_PROMPT_SUFFIX = "\n\n---\nUSER PROMPT: {user_prompt}"
+_JSON_BLOCK = re.compile(r"\{.*\}", re.DOTALL)
+
 class ContentGenerationCrew:
     """Crew that generates content using a team of specialized agents."""
 
@@ -29,31 +69,23 @@ class ContentGenerationCrew:
         logger.info("\n🚀 Initializing AI Content Generation Crew...")
         self.model = LLM(
             model="ollama/llama3.2:latest",
-            base_url="http://localhost:11434"
+            base_url="http://localhost:11434",
+            num_ctx=4096
         )
+        # Outlines only need a few hundred tokens, so each role gets its own
+        # output budget to bound decode time
+        planner_llm = self._make_llm(max_tokens=512)
+        writer_llm = self._make_llm(max_tokens=1536)
+        editor_llm = self._make_llm(max_tokens=1536)
         
-        # Define the agents with enhanced demo-friendly logging
-        def log_agent_action(agent_name: str, input_text: str, output_text: str):
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            print(f"\n{'='*80}")
-            print(f"⏰ {timestamp} | 🤖 {agent_name} is working...")
-            print(f"{'='*80}")
-            print(f"📥 INPUT:")
-            print(f"{'-'*80}")
-            print(f"{input_text}")
-            print(f"\n📤 OUTPUT:")
-            print(f"{'-'*80}")
-            print(f"{output_text}")
-            print(f"{'='*80}\n")
-
         # Define the agents
         self.planner = Agent(
             role="Content Planner",
             goal="Develop a comprehensive and structured content outline based on the user's prompt",
             backstory="An expert content strategist skilled at breaking down complex topics into manageable parts.",
-            verbose=True,  # Enable verbose mode
+            verbose=VERBOSE,
             allow_delegation=False,
-            llm=self.model,
+            llm=planner_llm,
             max_iterations=1  # Limit iterations for debugging
         )
         
@@ -61,9 +93,9 @@ class ContentGenerationCrew:
             role="Content Writer",
             goal="Produce captivating and informative content based on the outline",
             backstory="A versatile writer passionate about simplifying complex ideas.",
-            verbose=True,  # Enable verbose mode
+            verbose=VERBOSE,
             allow_delegation=False,
-            llm=self.model,
+            llm=writer_llm,
             max_iterations=1  # Limit iterations for debugging
         )
         
@@ -71,41 +103,44 @@ class ContentGenerationCrew:
             role="Content Editor",
             goal="Refine the content, ensuring clarity, coherence, and grammatical accuracy",
             backstory="A meticulous editor with a strong eye for detail.",
-            verbose=True,  # Enable verbose mode
+            verbose=VERBOSE,
             allow_delegation=False,
-            llm=self.model,
+            llm=editor_llm,
             max_iterations=1  # Limit iterations for debugging
         )
 
         # Define the tasks with enhanced logging
         self.planning_task = Task(
             description=(
-                "Create a detailed content outline for the following prompt: '{user_prompt}'.\n"
+                "Create a detailed content outline for the user prompt below.\n"
                 "Include main sections and key points that need to be addressed."
+                + USER_PROMPT_SUFFIX
             ),
             expected_output="A structured outline with headings and bullet points",
             agent=self.planner,
-            output_file="outline.txt"  # Add output file for logging
+            output_file="outline.txt" if VERBOSE else None
         )
 
         self.writing_task = Task(
             description=(
                 "Transform the outline into a comprehensive response. Use clear language and"
-                " examples where appropriate.\nThe user prompt is: '{user_prompt}'"
+                " examples where appropriate."
+                + USER_PROMPT_SUFFIX
             ),
             expected_output="A comprehensive response with clear language and examples",
             agent=self.writer,
-            output_file="draft.txt"  # Add output file for logging
+            output_file="draft.txt" if VERBOSE else None
         )
 
         self.editing_task = Task(
             description=(
                 "Review and polish the content, ensuring quality and alignment with both the"
-                " original prompt and outline.\nThe user prompt is: '{user_prompt}'"
+                " original prompt and outline."
+                + USER_PROMPT_SUFFIX
             ),
             expected_output="A polished, error-free response with enhanced structure and tone",
             agent=self.editor,
-            output_file="final.txt"  # Add output file for logging
+            output_file="final.txt" if VERBOSE else None
         )
 
         # Assemble the crew with detailed logging
@@ -113,39 +148,140 @@ class ContentGenerationCrew:
             agents=[self.planner, self.writer, self.editor],
             tasks=[self.planning_task, self.writing_task, self.editing_task],
             process=Process.sequential,
-            verbose=True,  # Enable crew-level verbose mode
-            output_log_file="crew_execution.json"  # Save detailed execution logs in JSON format
+            verbose=VERBOSE,
+            # Detailed JSON execution logs are only written when debugging
+            output_log_file="crew_execution.json" if VERBOSE else None
+        )
+
+        # Opt-in, so repeated runs stay deterministic unless asked otherwise
+        self.semantic_cache = (
+            SemanticCache(base_url="http://localhost:11434")
+            if os.getenv("SEMANTIC_CACHE") == "1"
+            else None
         )
+        self.unified = os.getenv("UNIFIED") == "1"
+        # Requests currently running on the crew, keyed like the exact cache
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _make_llm(self, max_tokens: int) -> LLM:
+        """Create a copy of the shared model settings with an output cap."""
+        return LLM(
+            model=self.model.model,
+            base_url=self.model.base_url,
+            num_ctx=4096,
+            max_tokens=max_tokens
+        )
+
+    def _cache_key(self, query: str) -> str:
+        """Key a prompt by model and generation mode, which give different output."""
+        mode = "unified" if self.unified else "crew"
+        return ExactCache.make_key(f"{self.model.model}|{mode}", query)
+
+    def invoke_unified(self, query: str) -> str:
+        """Generate content with one LLM call instead of three crew tasks."""
+        raw = self.model.call(UNIFIED_PROMPT + query)
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            # Models often wrap the object in a code fence or add chatter
+            match = _JSON_BLOCK.search(raw)
+            try:
+                data = json.loads(match.group(0)) if match else {}
+            except json.JSONDecodeError:
+                data = {}
+        final = data.get("final") if isinstance(data, dict) else None
+        return final if isinstance(final, str) and final else raw
 
     def invoke(self, query, session_id) -> dict:
         """Process content generation request."""
-        logger.info(f"\n📋 New Content Generation Task")
-        logger.info(f"🆔 Session: {session_id}")
-        logger.info(f"❓ Query: {query}\n")
+        logger.info("\n📋 New Content Generation Task")
+        logger.info("🆔 Session: %s", session_id)
+        logger.info("❓ Query: %s\n", query)
+
+        cache_key = self._cache_key(query)
+        cached = _EXACT_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info("♻️ Serving cached content for an identical prompt")
+            return {
+                "is_task_complete": True,
+                "require_user_input": False,
+                "content": cached
+            }
         
         inputs = {
             'user_prompt': query,
             'session_id': session_id,
         }
         
+        embedding = None
+        if self.semantic_cache is not None:
+            try:
+                embedding = self.semantic_cache.embed(query)
+                cached = self.semantic_cache.lookup(embedding)
+            except Exception as e:
+                logger.warning("Semantic cache unavailable: %s", e)
+                cached = None
+            if cached is not None:
+                logger.info("♻️ Serving cached content for a similar prompt")
+                return {
+                    "is_task_complete": True,
+                    "require_user_input": False,
+                    "content": cached
+                }
+
         logger.info("🎬 Starting CrewAI workflow...")
         
         try:
-            response = self.content_crew.kickoff(inputs)
+            if self.unified:
+                response = self.invoke_unified(query)
+            else:
+                response = self.content_crew.kickoff(inputs)
             logger.info("✅ Content generation completed successfully!")
+            _EXACT_CACHE.set(cache_key, str(response))
+            if embedding is not None:
+                self.semantic_cache.store(embedding, str(response))
             return {
                 "is_task_complete": True,
                 "require_user_input": False,
                 "content": response
             }
         except Exception as e:
-            logger.error(f"❌ Error during content generation: {str(e)}")
+            logger.error("❌ Error during content generation: %s", e)
             return {
                 "is_task_complete": True,
                 "require_user_input": False,
                 "content": f"Error during content generation: {str(e)}"
             }
 
-    async def stream(self, query: str) -> AsyncIterable[dict[str, Any]]:
-        """Streaming is not supported by CrewAI."""
-        raise NotImplementedError('Streaming is not supported by CrewAI.')
+    async def ainvoke(self, query, session_id) -> dict:
+        """Process a request off the event loop, sharing identical runs.
+
+        Concurrent callers sending the same prompt await the run that is
+        already in progress instead of starting the crew again.
+        """
+        key = self._cache_key(query)
+        # No await between the lookup and the insert, so this is race-free
+        future = self._inflight.get(key)
+        if future is not None:
+            logger.info("⏳ Joining an identical request already in progress")
+        else:
+            loop = asyncio.get_running_loop()
+            # The run is not tied to any one caller: cancelling a caller
+            # leaves it, and everyone else waiting on it, untouched
+            future = self._inflight[key] = asyncio.ensure_future(
+                loop.run_in_executor(_CREW_POOL, self.invoke, query, session_id)
+            )
+
+            def _finished(done: asyncio.Future) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+                # Mark a failure as retrieved when every caller has gone
+                if not done.cancelled():
+                    done.exception()
+
+            future.add_done_callback(_finished)
+        return await asyncio.shield(future)
+
+    async def stream(self, query: str, session_id: str) -> AsyncIterable[dict[str, Any]]:
+        """Yields the complete result once, as CrewAI has no partial output."""
+        yield await self.ainvoke(query, session_id)
@@ -0,0 +1,184 @@
+"""Response caches for the content generation crew.
+
+Each crew run costs three sequential LLM generations, so answers are kept
+around and served again for prompts that were already seen.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExactCache:
+    """A thread-safe LRU cache for responses to byte-identical prompts.
+
+    Entries can optionally be persisted to SQLite so hits survive restarts.
+    The table is capped at `maxsize` rows as well, dropping the least
+    recently used ones.
+    """
+
+    def __init__(self, maxsize: int = 512, db_path: str | Path | None = None):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path is not None:
+            db_path = Path(db_path).expanduser()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses'
+                ' (key TEXT PRIMARY KEY, response TEXT NOT NULL,'
+                ' updated_at REAL NOT NULL DEFAULT 0)'
+            )
+            columns = {
+                row[1]
+                for row in self._db.execute('PRAGMA table_info(responses)')
+            }
+            if 'updated_at' not in columns:
+                # Tables written before the cap have no recency column
+                self._db.execute(
+                    'ALTER TABLE responses'
+                    ' ADD COLUMN updated_at REAL NOT NULL DEFAULT 0'
+                )
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS responses_updated_at'
+                ' ON responses (updated_at)'
+            )
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Returns the cache key for a prompt sent to a given model."""
+        return hashlib.sha256(f'{model}|{prompt}'.encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                return response
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                'SELECT response FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._db:
+                self._db.execute(
+                    'UPDATE responses SET updated_at = ? WHERE key = ?',
+                    (time.time(), key),
+                )
+            self._put(key, row[0])
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        with self._lock:
+            self._put(key, response)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO responses'
+                        ' (key, response, updated_at) VALUES (?, ?, ?)',
+                        (key, response, time.time()),
+                    )
+                    self._db.execute(
+                        'DELETE FROM responses WHERE key NOT IN'
+                        ' (SELECT key FROM responses'
+                        ' ORDER BY updated_at DESC LIMIT ?)',
+                        (self.maxsize,),
+                    )
+
+    def _put(self, key: str, response: str) -> None:
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class SemanticCache:
+    """A TTL + LRU cache matching prompts by embedding cosine similarity.
+
+    Embeddings are fetched from Ollama and L2-normalized, so the inner
+    product of two entries is their cosine similarity.
+    """
+
+    def __init__(
+        self,
+        base_url: str = 'http://localhost:11434',
+        model: str = 'nomic-embed-text',
+        threshold: float = 0.92,
+        maxsize: int = 1024,
+        ttl: float | None = 3600.0,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[np.ndarray, str, float]] = (
+            OrderedDict()
+        )
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._client = httpx.Client(timeout=30.0)
+
+    def embed(self, text: str) -> np.ndarray:
+        """Returns the L2-normalized embedding of `text`."""
+        response = self._client.post(
+            f'{self.base_url}/api/embed',
+            json={'model': self.model, 'input': text},
+        )
+        response.raise_for_status()
+        vector = np.asarray(response.json()['embeddings'][0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding: np.ndarray) -> str | None:
+        """Returns the closest cached response above the threshold, if any."""
+        with self._lock:
+            self._evict_expired()
+            if not self._entries:
+                return None
+
+            keys = list(self._entries)
+            matrix = np.stack([self._entries[key][0] for key in keys])
+            scores = matrix @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] <= self.threshold:
+                return None
+
+            self._entries.move_to_end(keys[best])
+            logger.debug('Semantic cache hit (score=%.3f)', scores[best])
+            return self._entries[keys[best]][1]
+
+    def store(self, embedding: np.ndarray, response: str) -> None:
+        """Adds a response, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else float('inf')
+        with self._lock:
+            self._entries[self._next_id] = (embedding, response, expires_at)
+            self._next_id += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            key
+            for key, (_, _, expires_at) in self._entries.items()
+            if expires_at <= now
+        ]
+        for key in expired:
+            del self._entries[key]
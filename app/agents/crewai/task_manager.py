@@ -28,6 +28,8 @@ logger = logging.getLogger(__name__)
 class AgentTaskManager(InMemoryTaskManager):
     """Agent Task Manager, handles task routing and response packing."""
 
+    _SUPPORTED = frozenset(ContentGenerationCrew.SUPPORTED_CONTENT_TYPES)
+
     def __init__(self, agent: ContentGenerationCrew):
         super().__init__()
         self.agent = agent
@@ -41,9 +43,9 @@ class AgentTaskManager(InMemoryTaskManager):
         self, request: SendTaskRequest
     ) -> SendTaskResponse | AsyncIterable[SendTaskResponse]:
         ## only support text output at the moment
-        if not utils.are_modalities_compatible(
-            request.params.acceptedOutputModes,
-            ContentGenerationCrew.SUPPORTED_CONTENT_TYPES,
+        accepted_output_modes = request.params.acceptedOutputModes
+        if accepted_output_modes and self._SUPPORTED.isdisjoint(
+            accepted_output_modes
         ):
             logger.warning(
                 'Unsupported output mode. Received %s, Support %s',
@@ -60,38 +62,30 @@ class AgentTaskManager(InMemoryTaskManager):
     async def on_send_task_subscribe(
         self, request: SendTaskStreamingRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        error = self._validate_request(request)
-        if error:
-            return error
-
-        await self.upsert_task(request.params)
-
+        # Streaming is not supported, so fail before touching the task store
+        return utils.new_not_implemented_error(request.id)
 
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            result = self.agent.invoke(query, task_send_params.sessionId)
+            result = await self.agent.ainvoke(
+                query, task_send_params.sessionId
+            )
         except Exception as e:
             logger.error('Error invoking agent: %s', e)
             raise ValueError(f'Error invoking agent: {e}') from e
         
         try:
-            print(f'Final Result ===> {result}')
-
             agent_message = Message(
                 role='agent',
                 parts=[TextPart(text=str(result))],
                 metadata=None
             )
-            print(f'Agent message ===> {agent_message}')
-
             status = TaskStatus(
                 state=TaskState.COMPLETED,
                 message=agent_message
             )
-            print(f'Task status ===> {status}')
-
             task = Task(
                 id=task_send_params.id,
                 sessionId=task_send_params.sessionId,
@@ -100,8 +94,6 @@ class AgentTaskManager(InMemoryTaskManager):
                 history=None,
                 metadata=None
             )
-
-            print(f'Task ===> {task}')
         
         except Exception as e:
             logger.error('Error invoking agent: %s', e)
@@ -111,7 +103,8 @@ class AgentTaskManager(InMemoryTaskManager):
 
     def _get_user_query(self, task_send_params: TaskSendParams) -> str:
         part = task_send_params.message.parts[0]
-        if not isinstance(part, TextPart):
+        # Parts are a discriminated union, so the tag identifies the type
+        if part.type != 'text':
             raise ValueError('Only text parts are supported')
 
         return part.text
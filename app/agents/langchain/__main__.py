@@ -5,10 +5,11 @@ and starts the server to handle incoming requests.
 """
 
 import logging
+import os
 
 import click
 
-from agent import LangchainAgent
+from agent import LangchainAgent, aclose_http_clients
 from common.server import A2AServer
 from common.types import (
     AgentCapabilities,
@@ -16,6 +17,7 @@ from common.types import (
     AgentSkill,
     MissingAPIKeyError,
 )
+from common.utils.lazy_agent import LazyAgent
 from dotenv import load_dotenv
 from task_manager import AgentTaskManager
 
@@ -26,29 +28,39 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+CAPABILITIES = AgentCapabilities(streaming=False, pushNotifications=False) # Start without streaming and push notifications
+SKILL = AgentSkill(
+    id='langchain_agent',
+    name='Langchain Agent',
+    description='An agent that can discover and route messages to other agents.',
+    tags=['langchain', 'multi-agent', 'routing'],
+    examples=['Discover agents', 'Send this message to the text generator agent: generate a short story about a dog'],
+)
+# The url is filled in by main() once host and port are known
+AGENT_CARD = AgentCard(
+    name='Langchain Router Agent',
+    description='An agent that can discover and route messages to other agents.',
+    url='',
+    version='1.0.0',
+    defaultInputModes=LangchainAgent.SUPPORTED_CONTENT_TYPES,
+    defaultOutputModes=LangchainAgent.SUPPORTED_CONTENT_TYPES,
+    capabilities=CAPABILITIES,
+    skills=[SKILL],
+)
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10002) # Use a different default port
 def main(host, port):
     """Starts the Langchain Agent server."""
     try:
-        capabilities = AgentCapabilities(streaming=False, pushNotifications=False) # Start without streaming and push notifications
-        skill = AgentSkill(
-            id='langchain_agent',
-            name='Langchain Agent',
-            description='An agent that can discover and route messages to other agents.',
-            tags=['langchain', 'multi-agent', 'routing'],
-            examples=['Discover agents', 'Send this message to the text generator agent: generate a short story about a dog'],
-        )
-        agent_card = AgentCard(
-            name='Langchain Router Agent',
-            description='An agent that can discover and route messages to other agents.',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            defaultInputModes=LangchainAgent.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=LangchainAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
+        # The router itself is built lazily, so check its key up front
+        if not os.getenv('GOOGLE_API_KEY'):
+            raise MissingAPIKeyError('GOOGLE_API_KEY environment variable not set.')
+
+        agent_card = AGENT_CARD.model_copy(
+            update={'url': f'http://{host}:{port}/'}
         )
 
         logger.info("AgentCard created.")
@@ -56,11 +68,12 @@ def main(host, port):
         server = A2AServer(
             agent_card=agent_card,
             task_manager=AgentTaskManager(
-                agent=LangchainAgent(),
+                agent=LazyAgent(LangchainAgent),
             ),
             host=host,
             port=port,
         )
+        server.app.add_event_handler('shutdown', aclose_http_clients)
         logger.info(f'Starting server on {host}:{port}')
         server.start()
     except MissingAPIKeyError as e:
@@ -1,20 +1,27 @@
 import logging
-import uuid
+import re
+import secrets
+import time
 from typing import List, Dict, Any, Union
 import asyncio
+import concurrent.futures
+import threading
 from collections.abc import AsyncIterable
+from contextvars import ContextVar
 import httpx
 import os
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
 from langchain.agents import create_tool_calling_agent, AgentExecutor
+from langchain_core.agents import AgentAction, AgentFinish
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from common.client.card_resolver import A2ACardResolver
 from common.client.client import A2AClient
-from common.types import TaskSendParams, Message, TextPart
+from common.types import AgentCard, SendTaskResponse, TaskSendParams, Message, TextPart
+from common.utils.event_loop import new_event_loop
 
 # Load environment variables from .env file
 load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
@@ -24,40 +31,277 @@ logging.basicConfig(level=logging.INFO)
 logging.getLogger("langchain").setLevel(logging.WARNING)
 logger = logging.getLogger("agent")
 
-AGENT_URLS = ["http://localhost:10000", "http://localhost:10001"]
+CALCULATOR_AGENT_URL = "http://localhost:10000"
+CONTENT_AGENT_URL = "http://localhost:10001"
+AGENT_URLS = [CALCULATOR_AGENT_URL, CONTENT_AGENT_URL]
 DEFAULT_TIMEOUT: Union[float, tuple[float, float, float, float], None] = 180.0  # 3 minutes timeout
+CARD_FETCH_TIMEOUT = 5.0  # Wall-clock budget for fetching a single agent card
+# Agents may take minutes to answer, but a dead agent should fail fast
+ROUTE_TIMEOUT = httpx.Timeout(DEFAULT_TIMEOUT, connect=CARD_FETCH_TIMEOUT)
+# Requests beyond this wait for a slot instead of piling onto one agent
+MAX_ROUTES_PER_AGENT = 16
+# Executor tracing formats every step, so it is only enabled on request
+VERBOSE = os.getenv("AGENT_VERBOSE") == "1"
 
-@tool
-def discover_agents() -> List[Dict[str, Any]]:
-    """Discovers other A2A agents at predefined URLs."""
-    logger.info("🔍 Discovering available agents...")
-    discovered_agents = []
-    for url in AGENT_URLS:
-        try:
-            card = A2ACardResolver(url).get_agent_card()
-            discovered_agents.append({
-                "name": card.name,
-                "description": card.description,
-                "url": url
-            })
-            logger.info(f"✅ Found available agent '{card.name}' running at {url}")
-        except Exception as e:
-            logger.warning(f"❌ Could not reach agent at {url}: {e}")
+# Deterministic intents are routed without asking the LLM to pick an agent.
+# Each entry is (pattern, exception or None, agent URL). The first match
+# wins, so the arithmetic pattern must stay ahead of the keyword one
+FAST_ROUTE: List[tuple[re.Pattern, re.Pattern | None, str]] = [
+    # Bare arithmetic such as "(2 + 3) * 4" goes straight to the calculator
+    (re.compile(r"^[-+*/().\s\d]*\d[-+*/().\s\d]*$"), None, CALCULATOR_AGENT_URL),
+    # Writing keywords, unless the prompt mentions the calculator or holds
+    # a function call or arithmetic: "calculate sin(30) and write it"
+    (
+        re.compile(r"\b(write|article|blog|content)\b", re.IGNORECASE),
+        re.compile(
+            r"\b(calculat\w*|comput\w*|math\w*)\b|\w\s*\(|\d\s*[-+*/%^]\s*[\d(.]",
+            re.IGNORECASE,
+        ),
+        CONTENT_AGENT_URL,
+    ),
+]
+
+def _new_task_id() -> str:
+    """Returns a time-ordered task id: nanosecond timestamp + random suffix."""
+    return f"{time.time_ns():016x}{secrets.token_hex(4)}"
+
+def _fast_route(query: str) -> str | None:
+    """Returns the agent URL for a recognized intent, or None."""
+    for pattern, unless, agent_url in FAST_ROUTE:
+        if pattern.search(query) and not (unless and unless.search(query)):
+            return agent_url
+    return None
+
+_CARD_CACHE: TTLCache = TTLCache(maxsize=32, ttl=300)
+# Lists missing an agent are only kept briefly, so an agent that was still
+# starting up or briefly unreachable shows up on a later discovery
+_PARTIAL_CARD_CACHE: TTLCache = TTLCache(maxsize=32, ttl=10)
+
+def _cached_cards(urls: tuple[str, ...]) -> List[Dict[str, Any]] | None:
+    discovered_agents = _CARD_CACHE.get(urls)
+    if discovered_agents is None:
+        discovered_agents = _PARTIAL_CARD_CACHE.get(urls)
     return discovered_agents
 
-@tool
-async def route_message(agent_url: str, message: str, session_id: str) -> str:
+def _clear_card_caches() -> None:
+    _CARD_CACHE.clear()
+    _PARTIAL_CARD_CACHE.clear()
+
+class _LoopState:
+    """Connections and asyncio primitives shared by all calls on one loop.
+
+    Pooled connections, locks and semaphores are bound to the loop that
+    created them, so they are replaced together when the loop changes.
     """
-    Routes a message to another agent and returns their response.
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.http_client = httpx.AsyncClient(
+            timeout=CARD_FETCH_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=64, max_keepalive_connections=32
+            ),
+        )
+        self.card_lock = asyncio.Lock()
+        self.clients: dict[str, A2AClient] = {}
+        self.route_semaphores: dict[str, asyncio.Semaphore] = {}
+
+class _RouterState:
+    """Mutable module state, kept on one object instead of globals."""
+
+    def __init__(self):
+        # Shared state for the loop currently serving calls
+        self.loop_state: _LoopState | None = None
+        # Loop that runs the synchronous `invoke` wrapper
+        self.bg_loop: asyncio.AbstractEventLoop | None = None
+        # Closes still pending for pools left behind by a loop switch
+        self.closing: set[concurrent.futures.Future] = set()
+
+_STATE = _RouterState()
+_bg_loop_lock = threading.Lock()
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Returns the event loop used by the synchronous `invoke` wrapper."""
+    with _bg_loop_lock:
+        if _STATE.bg_loop is None:
+            loop = _STATE.bg_loop = new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="agent-loop", daemon=True
+            ).start()
+    return _STATE.bg_loop
+
+def _get_loop_state() -> _LoopState:
+    """Returns the shared state for the running loop, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    state = _STATE.loop_state
+    if state is None or state.loop is not loop:
+        if state is not None:
+            _retire_loop_state(state)
+        state = _STATE.loop_state = _LoopState(loop)
+    return state
+
+def _retire_loop_state(state: _LoopState) -> None:
+    """Closes the connection pool of a replaced _LoopState on its own loop."""
+    closing = state.http_client.aclose()
+    try:
+        future = asyncio.run_coroutine_threadsafe(closing, state.loop)
+    except RuntimeError:
+        # The loop is closed, so nothing can drive its connections any more
+        closing.close()
+        logger.warning("⚠️ Dropped the connection pool of a closed event loop")
+        return
+    # Runs as soon as the old loop does; keep it referenced until then
+    _STATE.closing.add(future)
+    future.add_done_callback(_STATE.closing.discard)
+
+def _get_a2a_client(agent_url: str) -> A2AClient:
+    """Returns the A2AClient for `agent_url`, sharing the pooled connections."""
+    state = _get_loop_state()
+    client = state.clients.get(agent_url)
+    if client is None:
+        client = state.clients[agent_url] = A2AClient(
+            url=agent_url, timeout=ROUTE_TIMEOUT, httpx_client=state.http_client
+        )
+    return client
+
+def _get_route_semaphore(agent_url: str) -> asyncio.Semaphore:
+    """Returns the semaphore capping in-flight requests to `agent_url`."""
+    semaphores = _get_loop_state().route_semaphores
+    semaphore = semaphores.get(agent_url)
+    if semaphore is None:
+        semaphore = semaphores[agent_url] = asyncio.Semaphore(MAX_ROUTES_PER_AGENT)
+    return semaphore
+
+async def aclose_http_clients() -> None:
+    """Closes the shared connection pool; call on server shutdown."""
+    state, _STATE.loop_state = _STATE.loop_state, None
+    if state is not None:
+        await state.http_client.aclose()
+
+async def _fetch_card(client: httpx.AsyncClient, url: str) -> AgentCard:
+    # httpx timeouts apply per phase; bound the whole fetch as well
+    response = await asyncio.wait_for(
+        client.get(f"{url.rstrip('/')}/.well-known/agent.json"),
+        CARD_FETCH_TIMEOUT,
+    )
+    response.raise_for_status()
+    return AgentCard(**response.json())
+
+async def discover_agent_cards(force_refresh: bool = False) -> List[Dict[str, Any]]:
+    """Returns the agents reachable at AGENT_URLS, cached for a few minutes.
+
+    A list missing any agent is cached for a few seconds only.
+
     Args:
-        agent_url: The URL of the target agent (e.g., http://localhost:10000)
-        message: The message to send
-        session_id: The session ID for tracking the conversation
+        force_refresh: Drop the cached cards and fetch them again.
+    """
+    urls = tuple(AGENT_URLS)
+    if not force_refresh:
+        discovered_agents = _cached_cards(urls)
+        if discovered_agents is not None:
+            return discovered_agents
+
+    state = _get_loop_state()
+    # Concurrent cache misses wait for a single round of fetches
+    async with state.card_lock:
+        if not force_refresh:
+            discovered_agents = _cached_cards(urls)
+            if discovered_agents is not None:
+                return discovered_agents
+        cards = await asyncio.gather(
+            *[_fetch_card(state.http_client, url) for url in urls], return_exceptions=True
+        )
+    discovered_agents = []
+    for url, card in zip(urls, cards, strict=True):
+        if isinstance(card, Exception):
+            logger.warning(f"❌ Could not reach agent at {url}: {card}")
+            continue
+        discovered_agents.append({
+            "name": card.name,
+            "description": card.description,
+            "url": url
+        })
+        logger.info(f"✅ Found available agent '{card.name}' running at {url}")
+    if len(discovered_agents) == len(urls):
+        _CARD_CACHE[urls] = discovered_agents
+    else:
+        _PARTIAL_CARD_CACHE[urls] = discovered_agents
+    return discovered_agents
+
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+def _prefetch_agent_cards() -> None:
+    """Starts discovering agents in the background unless the cache is warm.
+
+    The first model turn almost always calls discover_agents; fetching the
+    cards while that turn decodes lets the tool return from the cache.
+    """
+    if _cached_cards(tuple(AGENT_URLS)) is not None:
+        return
+    task = asyncio.create_task(discover_agent_cards())
+    # The loop only keeps weak references to tasks
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+@tool
+async def discover_agents() -> List[Dict[str, Any]]:
+    """Discovers other A2A agents at predefined URLs."""
+    logger.info("🔍 Discovering available agents...")
+    return await discover_agent_cards()
+
+def _first_text(parts: List[Any]) -> str | None:
+    return next(
+        (part.text for part in parts if isinstance(part, TextPart) and part.text),
+        None
+    )
+
+def _extract_text(response: SendTaskResponse) -> str | None:
+    """Returns the agent's reply from its status message or artifacts."""
+    task = response.result
+    try:
+        message = task.status.message
+        text = _first_text(message.parts) if message is not None else None
+        if text is None:
+            for artifact in task.artifacts or ():
+                text = _first_text(artifact.parts)
+                if text is not None:
+                    break
+        return text
+    except AttributeError:
+        # Error responses carry no task
+        return None
+
+# Holder for the latest routing result of the current request. Tools run in
+# a copy of the caller's context, so they fill in the shared dict instead of
+# setting the variable themselves
+_last_route: ContextVar[Dict[str, Any] | None] = ContextVar("last_route", default=None)
+
+def _record_route(result: Any) -> Any:
+    holder = _last_route.get()
+    if holder is not None:
+        holder["result"] = result
+    return result
+
+def _route_result(ok: bool, content: str) -> Dict[str, Any]:
+    return {"ok": ok, "content": content}
+
+def _unpack_route(output: Any) -> tuple[bool, str]:
+    """Returns whether route_message(s) reached an agent, and the text."""
+    results = output if isinstance(output, list) else [output]
+    ok = any(result["ok"] for result in results)
+    return ok, "\n\n".join(result["content"] for result in results)
+
+async def _send_message(agent_url: str, message: str, session_id: str) -> Dict[str, Any]:
+    """Sends one message over A2A.
+
+    Returns:
+        A dict with "ok", False when the agent could not be reached or gave
+        no usable reply, and "content", the reply or an error text.
     """
     try:
         logger.info(f"🔗 Routing message to agent at {agent_url} with session_id: {session_id}")
-        client = A2AClient(url=agent_url, timeout=DEFAULT_TIMEOUT)
-        task_id = str(uuid.uuid4())
+        client = _get_a2a_client(agent_url)
+        task_id = _new_task_id()
         request = TaskSendParams(
             id=task_id,
             sessionId=session_id,
@@ -67,52 +311,100 @@ async def route_message(agent_url: str, message: str, session_id: str) -> str:
         logger.info(f"🚀 Forwarding request to agent at {agent_url} (timeout: {DEFAULT_TIMEOUT}s)")
         
         try:
-            response = await client.send_task(request)
+            async with _get_route_semaphore(agent_url):
+                response = await client.send_task(request)
         except httpx.ReadTimeout:
             error_msg = f"⏰ Request timed out after {DEFAULT_TIMEOUT} seconds waiting for {agent_url}"
             logger.error(error_msg)
-            return f"{error_msg}. The agent might be busy or not responding. Try increasing the timeout or try again later."
+            return _route_result(False, f"{error_msg}. The agent might be busy or not responding. Try increasing the timeout or try again later.")
         except httpx.ConnectError:
+            # The agent may be gone; have the next discovery check again
+            _clear_card_caches()
             error_msg = f"❌ Connection failed to {agent_url}"
             logger.error(error_msg)
-            return f"{error_msg}. Please check if the agent is running and accessible."
+            return _route_result(False, f"{error_msg}. Please check if the agent is running and accessible.")
         except httpx.HTTPError as e:
+            _clear_card_caches()
             error_msg = f"HTTP error occurred while connecting to {agent_url}: {e}"
             logger.error(error_msg)
-            return f"Error communicating with agent: {str(e)}"
+            return _route_result(False, f"Error communicating with agent: {str(e)}")
         
-        # Enhanced response handling
-        if response and hasattr(response, 'result'):
-            result = response.result
-            
-            # Check if there's a status with a message
-            if hasattr(result, 'status') and hasattr(result.status, 'message'):
-                if hasattr(result.status.message, 'parts'):
-                    for part in result.status.message.parts:
-                        if hasattr(part, 'text') and part.text:
-                            return part.text
-            
-            # Fallback to checking result content
-            if hasattr(result, 'content'):
-                return result.content
-            
-            # Check artifacts as last resort
-            if hasattr(result, 'artifacts') and result.artifacts:
-                for artifact in result.artifacts:
-                    if hasattr(artifact, 'parts') and artifact.parts:
-                        for part in artifact.parts:
-                            if hasattr(part, 'text') and part.text:
-                                return part.text
-            
-            logger.warning(f"⚠️ Unexpected response format received: {response}")
-            return "Unable to extract response from agent"
-            
-        return "No response received from agent"
+        if not response:
+            return _route_result(False, "No response received from agent")
+
+        text = _extract_text(response)
+        if text is not None:
+            return _route_result(True, text)
+
+        logger.warning(f"⚠️ Unexpected response format received: {response}")
+        return _route_result(False, "Unable to extract response from agent")
     except Exception as e:
-        import traceback
-        logger.error(f"Failed to route message: {str(e)}")
-        logger.error(f"Traceback:\n{traceback.format_exc()}")
-        return f"Error processing agent response: {str(e)}. Check logs for details."
+        logger.exception("Failed to route message: %s", e)
+        return _route_result(False, f"Error processing agent response: {str(e)}. Check logs for details.")
+
+@tool
+async def route_message(agent_url: str, message: str, session_id: str) -> Dict[str, Any]:
+    """
+    Routes a message to another agent and returns their response.
+    The result has "ok", whether the agent replied, and "content", the reply or error.
+    Args:
+        agent_url: The URL of the target agent (e.g., http://localhost:10000)
+        message: The message to send
+        session_id: The session ID for tracking the conversation
+    """
+    return _record_route(await _send_message(agent_url, message, session_id))
+
+_INVOCATION_KEYS = ("agent_url", "message", "session_id")
+
+@tool
+async def route_messages(invocations: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Routes messages to several agents concurrently and returns their responses in the same order.
+    Args:
+        invocations: One entry per message, each with the keys agent_url, message and session_id
+    """
+    async def send(invocation: Dict[str, str]) -> Dict[str, Any]:
+        missing = [key for key in _INVOCATION_KEYS if not invocation.get(key)]
+        if missing:
+            return _route_result(False, f"Invalid invocation, missing: {', '.join(missing)}")
+        return await _send_message(*(invocation[key] for key in _INVOCATION_KEYS))
+
+    logger.info(f"🔀 Routing {len(invocations)} messages concurrently")
+    return _record_route(list(await asyncio.gather(*(send(i) for i in invocations))))
+
+# The session id comes last, so the instructions before it are the same
+# prefix for every request
+ROUTER_SYSTEM_PROMPT = """You route each user message to the most suitable agent.
+1. Call discover_agents to list the available agents.
+2. Match the task to an agent: content generation for articles, stories and explanations; the calculator for math only.
+3. Call route_message with an agent_url from discover_agents, the message unchanged and the session ID below.
+4. If several agents are needed, call route_messages once with one invocation per agent.
+Session ID: {session_id}"""
+
+# Parsed once at import and shared by every LangchainAgent instance
+ROUTER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", ROUTER_SYSTEM_PROMPT),
+    ("human", "{message}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad"),
+])
+ROUTER_TOOLS = [discover_agents, route_message, route_messages]
+
+ROUTE_TOOL_NAMES = frozenset({"route_message", "route_messages"})
+
+class RoutingAgentExecutor(AgentExecutor):
+    """AgentExecutor that finishes as soon as a routed agent has replied.
+
+    The routed reply is already the answer, so the model is not asked for
+    another turn to restate it. Failed routes still go back to the model
+    so it can retry.
+    """
+
+    def _get_tool_return(self, next_step_output: tuple[AgentAction, Any]) -> AgentFinish | None:
+        agent_action, observation = next_step_output
+        if agent_action.tool in ROUTE_TOOL_NAMES and _unpack_route(observation)[0]:
+            return_value_key = self.agent.return_values[0] if self.agent.return_values else "output"
+            return AgentFinish({return_value_key: observation}, "")
+        return super()._get_tool_return(next_step_output)
 
 class LangchainAgent:
     SUPPORTED_CONTENT_TYPES = ['text', 'text/plain']
@@ -124,22 +416,9 @@ class LangchainAgent:
             temperature=0,
             google_api_key=os.environ.get("GOOGLE_API_KEY")
         )
-        self.tools = [discover_agents, route_message]
-
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a message routing assistant that intelligently forwards messages to the most appropriate agent based on their capabilities."),
-            ("system", """Steps:
-                1. Call discover_agents *tool* to get available agents
-                2. Choose the most appropriate agent by matching the task to agent capabilities:
-                   - A Content Generation Agentic System: For writing articles, stories, explanations
-                   - A Calculator Agent: For math calculations only
-                3. Call route_message *tool* with:
-                   - agent_url from discover_agents results only
-                   - message unchanged
-                   - session_id exactly as provided"""),
-            ("human", "{message}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad"),
-        ])
+        self.tools = ROUTER_TOOLS
+
+        self.prompt = ROUTER_PROMPT
 
         self.agent = create_tool_calling_agent(
             llm=self.model,
@@ -147,67 +426,72 @@ class LangchainAgent:
             prompt=self.prompt
         )
 
-        self.runnable = AgentExecutor.from_agent_and_tools(
+        self.runnable = RoutingAgentExecutor.from_agent_and_tools(
             agent=self.agent,
             tools=self.tools, 
-            verbose=True,
+            verbose=VERBOSE,
             handle_parsing_errors=True,
-            return_intermediate_steps=True
+            # Routing results are collected through _last_route instead
+            return_intermediate_steps=VERBOSE
         )
 
     async def async_invoke(self, query: str, session_id: str) -> Dict[str, Any]:
         try:
             logger.info(f"🤖 Starting agent with query: '{query}' with session_id: {session_id}")
-            # Reinitialize the model and agent to ensure a fresh connection
-            self.model = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash-preview-04-17",
-                temperature=0,
-                google_api_key=os.environ.get("GOOGLE_API_KEY")
-            )
-            # Recreate the agent with the new model
-            self.agent = create_tool_calling_agent(
-                llm=self.model,
-                tools=self.tools,
-                prompt=self.prompt
-            )
-            # Update the runnable with the new agent
-            self.runnable = AgentExecutor.from_agent_and_tools(
-                agent=self.agent,
-                tools=self.tools,
-                verbose=True,
-                handle_parsing_errors=True,
-                return_intermediate_steps=True,
-            )
-            # Pass a single input dict
-            output = await self.runnable.ainvoke({
-                "message": query,
-                "session_id": session_id
-            })
+            agent_url = _fast_route(query)
+            if agent_url is not None:
+                logger.info(f"⚡️ Fast route matched, forwarding to {agent_url}")
+                result = await route_message.ainvoke({
+                    "agent_url": agent_url,
+                    "message": query,
+                    "session_id": session_id
+                })
+                if result["ok"]:
+                    return {
+                        "is_task_complete": True,
+                        "require_user_input": False,
+                        "content": result["content"]
+                    }
+                # A keyword hit is only a guess; let the LLM pick instead
+                logger.warning(f"⚠️ Fast route to {agent_url} failed, falling back to the LLM router")
+
+            _prefetch_agent_cards()
+            # The last routing call wins, so a successful retry replaces an
+            # earlier failure
+            routes: Dict[str, Any] = {}
+            token = _last_route.set(routes)
+            try:
+                # Pass a single input dict
+                output = await self.runnable.ainvoke({
+                    "message": query,
+                    "session_id": session_id
+                })
+            finally:
+                _last_route.reset(token)
 
             logger.info("✅ Agent execution completed successfully with output:")
             
             # Enhanced response handling
             if isinstance(output, dict):
-                steps = output.get('intermediate_steps', [])
-                logger.info(f"🔍 Found {len(steps)} intermediate steps in the output")
-                for step in reversed(steps):
-                    if isinstance(step, tuple) and len(step) == 2:
-                        action, result = step
-                        if action.tool == 'route_message':
-                            logger.info(f"✨ Response received: {result}")
-                            if isinstance(result, str) and not result.startswith("Routing failed"):
-                                return {
-                                    "is_task_complete": True,
-                                    "require_user_input": False,
-                                    "content": result
-                                }
+                last_route = routes.get("result")
+                error = "Failed to get response from target agent."
+                if last_route is not None:
+                    ok, content = _unpack_route(last_route)
+                    logger.info(f"✨ Response received: {content}")
+                    if ok:
+                        return {
+                            "is_task_complete": True,
+                            "require_user_input": False,
+                            "content": content
+                        }
+                    error = f"{error} {content}"
                 
                 # If we got here, no valid route_message response was found
                 logger.warning("❌ No valid response received from target agent")
                 return {
                     "is_task_complete": True,
                     "require_user_input": False,
-                    "content": "Failed to get response from target agent."
+                    "content": error
                 }
             
             return {
@@ -226,19 +510,23 @@ class LangchainAgent:
     def invoke(self, query: str, session_id: str) -> Dict[str, Any]:
         """
         Synchronous wrapper for async_invoke.
-        This method ensures we properly handle the async/sync boundary.
+        Runs on a long-lived background loop so pooled connections survive
+        between calls; async callers should await async_invoke directly.
         """
         try:
             logger.info(f"🎯 Processing request: '{query}'")
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                logger.warning("⚡️ Event loop already active - switching to thread execution")
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(lambda: asyncio.run(self.async_invoke(query, session_id)))
-                    return future.result()
-            else:
-                return loop.run_until_complete(self.async_invoke(query, session_id))
+            loop = _get_background_loop()
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if running_loop is loop:
+                # Blocking on the loop that must run the coroutine would deadlock
+                raise RuntimeError("invoke() called from the agent loop; await async_invoke() instead")
+            future = asyncio.run_coroutine_threadsafe(
+                self.async_invoke(query, session_id), loop
+            )
+            return future.result()
         except Exception as e:
             logger.exception(f"Error in invoke: {e}")
             return {
@@ -248,5 +536,52 @@ class LangchainAgent:
             }
 
     async def stream(self, query: str, session_id: str) -> AsyncIterable[Dict[str, Any]]:
-        logger.warning("⚠️ Streaming functionality is not yet implemented")
-        raise NotImplementedError("Streaming is not implemented.")
+        """Yields model tokens and routed replies as they arrive.
+
+        Intermediate items have is_task_complete=False; the last item holds
+        the routed agent's reply.
+        """
+        logger.info(f"🌊 Streaming agent with query: '{query}' with session_id: {session_id}")
+        agent_url = _fast_route(query)
+        if agent_url is not None:
+            result = await route_message.ainvoke({
+                "agent_url": agent_url,
+                "message": query,
+                "session_id": session_id
+            })
+            if result["ok"]:
+                yield {
+                    "is_task_complete": True,
+                    "require_user_input": False,
+                    "content": result["content"]
+                }
+                return
+            logger.warning(f"⚠️ Fast route to {agent_url} failed, falling back to the LLM router")
+
+        _prefetch_agent_cards()
+        final = None
+        async for event in self.runnable.astream_events(
+            {"message": query, "session_id": session_id}, version="v2"
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if isinstance(content, str) and content:
+                    yield {
+                        "is_task_complete": False,
+                        "require_user_input": False,
+                        "content": content
+                    }
+            elif kind == "on_tool_end" and event["name"] in ROUTE_TOOL_NAMES:
+                _, final = _unpack_route(event["data"].get("output"))
+                yield {
+                    "is_task_complete": False,
+                    "require_user_input": False,
+                    "content": final
+                }
+
+        yield {
+            "is_task_complete": True,
+            "require_user_input": False,
+            "content": final if final is not None else "Failed to get response from target agent."
+        }
@@ -1,5 +1,4 @@
 import logging
-import traceback
 
 from collections.abc import AsyncIterable
 from typing import Any
@@ -45,7 +44,7 @@ class AgentTaskManager(InMemoryTaskManager):
     async def on_send_task(
         self, request: SendTaskRequest
     ) -> SendTaskResponse | AsyncIterable[SendTaskResponse]:
-        logger.info(f"[A2A] Received 'tasks/send' request: id={request.id}, params={request.params}")
+        logger.info("[A2A] Received 'tasks/send' request: id=%s, params=%s", request.id, request.params)
         # Validate input modes (assuming only text is supported for now)
         if not utils.are_modalities_compatible(
             request.params.acceptedOutputModes,
@@ -62,8 +61,7 @@ class AgentTaskManager(InMemoryTaskManager):
         try:
             await self.upsert_task(task_send_params)
         except Exception as e:
-            logger.error(f"[on_send_task] Error during upsert_task: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("[on_send_task] Error during upsert_task: %s", e)
             return JSONRPCResponse(
                 id=request.id,
                 error=InternalError(
@@ -75,7 +73,7 @@ class AgentTaskManager(InMemoryTaskManager):
         try:
             query = self._get_user_query(task_send_params)
         except ValueError as e:
-            logger.error(f"[on_send_task] Error extracting user query: {e}")
+            logger.error("[on_send_task] Error extracting user query: %s", e)
             return SendTaskResponse(
                 id=request.id,
                 error=InvalidParamsError(message=str(e)),
@@ -83,13 +81,13 @@ class AgentTaskManager(InMemoryTaskManager):
 
         # Invoke the Langchain agent
         try:
-            logger.info(f"[A2A] Invoking Langchain agent with query: {query}, sessionId={task_send_params.sessionId}")
-            agent_response = self.agent.invoke(
+            logger.info("[A2A] Invoking Langchain agent with query: %s, sessionId=%s", query, task_send_params.sessionId)
+            agent_response = await self.agent.async_invoke(
                 query, task_send_params.sessionId
             )
-            logger.info(f"[A2A] Agent response for request id={request.id}: {agent_response}")
+            logger.info("[A2A] Agent response for request id=%s: %s", request.id, agent_response)
         except Exception as e:
-            logger.error(f'Error invoking agent: {e}')
+            logger.exception('Error invoking agent: %s', e)
             # Update task status to failed
             await self.update_store(
                 request.params.id, TaskStatus(state=TaskState.FAILED), None
@@ -100,14 +98,14 @@ class AgentTaskManager(InMemoryTaskManager):
             )
 
         # Process and format the agent's response
-        logger.info(f"[on_send_task] Returning processed agent response for request id={request.id}")
+        logger.info("[on_send_task] Returning processed agent response for request id=%s", request.id)
         return await self._process_agent_response(request, agent_response)
 
 
     async def on_send_task_subscribe(
         self, request: SendTaskStreamingRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        logger.info(f"[A2A] Received 'tasks/sendSubscribe' request: id={request.id}, params={request.params}. Streaming is not implemented.")
+        logger.info("[A2A] Received 'tasks/sendSubscribe' request: id=%s, params=%s. Streaming is not implemented.", request.id, request.params)
         # Streaming is not implemented for this agent
         return JSONRPCResponse(
             id=request.id,
@@ -117,7 +115,7 @@ class AgentTaskManager(InMemoryTaskManager):
     async def on_resubscribe_to_task(
         self, request
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        logger.info(f"[A2A] Received 'tasks/resubscribe' request: id={request.id}, params={request.params}. Resubscription is not applicable as streaming is not supported.")
+        logger.info("[A2A] Received 'tasks/resubscribe' request: id=%s, params=%s. Resubscription is not applicable as streaming is not supported.", request.id, request.params)
         # Resubscription is not applicable as streaming is not supported
         return JSONRPCResponse(
             id=request.id,
@@ -128,7 +126,7 @@ class AgentTaskManager(InMemoryTaskManager):
         self, request: SendTaskRequest, agent_response: dict
     ) -> SendTaskResponse:
         """Processes the agent's response and updates the task store."""
-        logger.info(f"[_process_agent_response] Processing agent response for request id={request.id}: {agent_response}")
+        logger.info("[_process_agent_response] Processing agent response for request id=%s: %s", request.id, agent_response)
         task_send_params: TaskSendParams = request.params
         task_id = task_send_params.id
         history_length = task_send_params.historyLength
@@ -136,7 +134,7 @@ class AgentTaskManager(InMemoryTaskManager):
         artifact = None
 
         parts = [{'type': 'text', 'text': agent_response.get('content', '')}]
-        logger.info(f"[_process_agent_response] Extracted parts: {parts}")
+        logger.info("[_process_agent_response] Extracted parts: %s", parts)
 
         if agent_response.get('require_user_input', False):
             logger.info("[_process_agent_response] Agent response requires user input.")
@@ -154,27 +152,28 @@ class AgentTaskManager(InMemoryTaskManager):
             task_status = TaskStatus(state=TaskState.COMPLETED)
             artifact = Artifact(parts=parts)
 
-        logger.info(f"[_process_agent_response] Updating store for task {task_id} with status: {task_status.state}")
+        logger.info("[_process_agent_response] Updating store for task %s with status: %s", task_id, task_status.state)
         task = await self.update_store(
             task_id, task_status, None if artifact is None else [artifact]
         )
-        logger.info(f"[_process_agent_response] Store updated. Appending task history.")
+        logger.info("[_process_agent_response] Store updated. Appending task history.")
         task_result = self.append_task_history(task, history_length)
-        logger.info(f"[_process_agent_response] Task history appended. Returning SendTaskResponse.")
+        logger.info("[_process_agent_response] Task history appended. Returning SendTaskResponse.")
 
         return SendTaskResponse(id=request.id, result=task_result)
 
     def _get_user_query(self, task_send_params: TaskSendParams) -> str:
-        logger.info(f"[_get_user_query] Extracting user query for task {task_send_params.id}.")
+        logger.debug("[_get_user_query] Extracting user query for task %s.", task_send_params.id)
         if not task_send_params.message or not task_send_params.message.parts:
             logger.error("[_get_user_query] Message or message parts are missing.")
             raise ValueError("Message or message parts are missing in the request.")
 
         # Find the first text part
-        for part in task_send_params.message.parts:
-            if isinstance(part, TextPart):
-                logger.info(f"[_get_user_query] Found text part: {part.text}")
-                return part.text
-
-        logger.error("[_get_user_query] No text parts found in the message.")
-        raise ValueError('No text parts found in the message.')
+        text = next(
+            (part.text for part in task_send_params.message.parts if isinstance(part, TextPart)),
+            None
+        )
+        if text is None:
+            logger.error("[_get_user_query] No text parts found in the message.")
+            raise ValueError('No text parts found in the message.')
+        return text
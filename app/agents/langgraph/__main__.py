@@ -22,33 +22,39 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+CAPABILITIES = AgentCapabilities(streaming=True, pushNotifications=True)
+SKILL = AgentSkill(
+    id='calculate',
+    name='Calculator Skill',
+    description='Performs mathematical calculations using Python math functions',
+    tags=['calculator', 'math', 'arithmetic'],
+    examples=[
+        'What is 2 + 2?',
+        'Calculate sin(30) * pi',
+        'What is the square root of 16?'
+    ],
+)
+# The url is filled in by main() once host and port are known
+AGENT_CARD = AgentCard(
+    name='Calculator Agent',
+    description='Helps with mathematical calculations',
+    url='',
+    version='1.0.0',
+    defaultInputModes=CalculationAgent.SUPPORTED_CONTENT_TYPES,
+    defaultOutputModes=CalculationAgent.SUPPORTED_CONTENT_TYPES,
+    capabilities=CAPABILITIES,
+    skills=[SKILL],
+)
+
+
 @click.command()
 @click.option('--host', 'host', default='localhost')
 @click.option('--port', 'port', default=10000)
 def main(host, port):
     """Starts the Calculator Agent server."""
     try:
-        capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
-        skill = AgentSkill(
-            id='calculate',
-            name='Calculator Skill',
-            description='Performs mathematical calculations using Python math functions',
-            tags=['calculator', 'math', 'arithmetic'],
-            examples=[
-                'What is 2 + 2?',
-                'Calculate sin(30) * pi',
-                'What is the square root of 16?'
-            ],
-        )
-        agent_card = AgentCard(
-            name='Calculator Agent',
-            description='Helps with mathematical calculations',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            defaultInputModes=CalculationAgent.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=CalculationAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
+        agent_card = AGENT_CARD.model_copy(
+            update={'url': f'http://{host}:{port}/'}
         )
 
         notification_sender_auth = PushNotificationSenderAuth()
@@ -1,7 +1,14 @@
+from collections import OrderedDict
 from collections.abc import AsyncIterable
+from types import CodeType
 from typing import Any, Literal
+import ast
+import functools
+import json
 import logging
 import math
+import re
+import threading
 
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
@@ -12,7 +19,103 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 
 logger = logging.getLogger(__name__)
-memory = MemorySaver()
+
+
+class BoundedMemorySaver(MemorySaver):
+    """MemorySaver that keeps the checkpoints of the most recent threads only.
+
+    The stock saver never forgets a thread, so a long-running server grows
+    with every session it has seen.
+    """
+
+    def __init__(self, max_threads: int = 1024):
+        super().__init__()
+        self.max_threads = max_threads
+        self._threads: OrderedDict[str, None] = OrderedDict()
+        self._threads_lock = threading.Lock()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config['configurable']['thread_id']
+        with self._threads_lock:
+            self._threads[thread_id] = None
+            self._threads.move_to_end(thread_id)
+            evicted = []
+            while len(self._threads) > self.max_threads:
+                evicted.append(self._threads.popitem(last=False)[0])
+        for old_thread_id in evicted:
+            self.delete_thread(old_thread_id)
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
+memory = BoundedMemorySaver()
+
+_FUNCTIONS = frozenset({'abs', 'sqrt', 'sin', 'cos', 'tan'})
+_CONSTANTS = frozenset({'pi', 'e'})
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv,
+    ast.Mod, ast.Pow, ast.UAdd, ast.USub,
+)
+# Exponents may only combine plain numbers, so powers cannot be stacked
+_EXPONENT_NODES = (
+    ast.Constant, ast.BinOp, ast.UnaryOp, ast.Add, ast.Sub, ast.Mult,
+    ast.Div, ast.UAdd, ast.USub,
+)
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+# Shared eval namespaces; compiled expressions only read from them
+_SAFE_GLOBALS = {'__builtins__': {}}
+_SAFE_LOCALS = {
+    'abs': abs,
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'pi': math.pi,
+    'e': math.e
+}
+
+def _compile(expr: str) -> CodeType:
+    """Parse, whitelist and compile an expression."""
+    tree = ast.parse(expr, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f'Unsupported syntax: {type(node).__name__}')
+        if isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)):
+                raise ValueError(f'Unsupported constant: {node.value!r}')
+            # Float arithmetic overflows instead of building huge integers,
+            # so no expression can keep the evaluator busy
+            node.value = float(node.value)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            if not all(
+                isinstance(child, _EXPONENT_NODES)
+                for child in ast.walk(node.right)
+            ):
+                raise ValueError('Exponents must be plain numbers')
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name)
+            or node.func.id not in _FUNCTIONS
+            or node.keywords
+        ):
+            raise ValueError('Unsupported function call')
+        if isinstance(node, ast.Name) and node.id not in _FUNCTIONS | _CONSTANTS:
+            raise ValueError(f"Unknown name '{node.id}'")
+    return compile(tree, '<calc>', 'eval')
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate(expr: str) -> tuple[bool, float | str]:
+    """Evaluate an expression once per distinct string.
+
+    Returns (True, result) or (False, error message); errors are returned
+    rather than raised so that they are cached as well.
+    """
+    if _NUMBER.fullmatch(expr):
+        # The model often just restates the answer
+        return True, float(expr)
+    try:
+        return True, float(eval(_compile(expr), _SAFE_GLOBALS, _SAFE_LOCALS))
+    except Exception as e:
+        return False, str(e)
 
 @tool
 def calculate(expression: str) -> dict:
@@ -25,22 +128,13 @@ def calculate(expression: str) -> dict:
     if not isinstance(expression, str):
         return {'error': 'Expression must be a string', 'expression': str(expression)}
         
-    try:
-        expr = expression.strip()
-        safe_dict = {
-            'abs': abs,
-            'sqrt': math.sqrt, 
-            'sin': math.sin, 
-            'cos': math.cos, 
-            'tan': math.tan,
-            'pi': math.pi, 
-            'e': math.e
-        }
-        
-        result = eval(expr, {"__builtins__": {}}, safe_dict)
-        return {'result': float(result), 'expression': expr}
-    except Exception as e:
-        return {'error': str(e), 'expression': expression}
+    expr = expression.strip()
+    ok, value = _evaluate(expr)
+    if ok:
+        return {'result': value, 'expression': expr}
+    return {'error': value, 'expression': expression}
+
+TOOLS = [calculate]
 
 
 class ResponseFormat(BaseModel):
@@ -57,7 +151,12 @@ class ResponseFormat(BaseModel):
         result = calc_result['result']
         if isinstance(result, (int, float)):
             # Format integers as is, floats with up to 6 decimals
-            formatted = f"{float(result):.6f}".rstrip('0').rstrip('.') if isinstance(result, float) else str(result)
+            if not isinstance(result, float):
+                formatted = str(result)
+            elif result.is_integer():
+                formatted = str(int(result))
+            else:
+                formatted = f"{result:.6f}".rstrip('0').rstrip('.')
             return cls(status='completed', message=formatted)
         
         return cls(status='error', message='Invalid result type')
@@ -102,48 +201,62 @@ STRICT REQUIREMENTS:
         )
         self.graph = create_react_agent(
             self.model,
-            tools=[calculate],
+            tools=TOOLS,
             checkpointer=memory,
             prompt=self.SYSTEM_INSTRUCTION
         )
 
     def invoke(self, query: str, sessionId: str) -> dict:
-        logger.info(f"🤔 Processing calculation request: '{query}'")
+        logger.info("🤔 Processing calculation request: '%s'", query)
         config = {'configurable': {'thread_id': sessionId}}
         response = self.graph.invoke({'messages': [('user', query)]}, config)
-        logger.info(f"⚡️ Starting calculation pipeline...")
+        logger.info("⚡️ Starting calculation pipeline...")
         result = self.get_agent_response(config)
-        logger.info(f"✨ Result: {result['content']}")
+        logger.info("✨ Result: %s", result['content'])
         return result
 
     async def stream(self, query: str, sessionId: str) -> AsyncIterable[dict[str, Any]]:
-        logger.info(f"🚀 Starting interactive calculation session")
-        logger.info(f"📝 User Query: '{query}'")
+        logger.info("🚀 Starting interactive calculation session")
+        logger.info("📝 User Query: '%s'", query)
         inputs = {'messages': [('user', query)]}
         config = {'configurable': {'thread_id': sessionId}}
 
-        for item in self.graph.stream(inputs, config, stream_mode='values'):
+        # Every intermediate step reports the same status, so clients only
+        # need to hear it once
+        announced = False
+        # astream awaits the model instead of blocking the event loop
+        async for item in self.graph.astream(inputs, config, stream_mode='values'):
             message = item['messages'][-1]
             if isinstance(message, (AIMessage, ToolMessage)):
-                logger.info(f"🧮 Processing mathematical expression...")
-                if hasattr(message, 'content'):
-                    logger.info(f"💭 AI thinking process: {message.content}")
-                if hasattr(message, 'tool_calls'):
-                    logger.info(f"🛠️ Mathematical tools in use: {message.tool_calls}")
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': 'Computing...',
-                }
+                # Skip building per-chunk log records when INFO is filtered
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("🧮 Processing mathematical expression...")
+                    logger.info(
+                        "💭 %s message, %d chars",
+                        message.type, len(message.content or ''),
+                    )
+                    tool_calls = getattr(message, 'tool_calls', None)
+                    if tool_calls:
+                        logger.info(
+                            "🛠️ Mathematical tools in use: %s",
+                            ', '.join(call['name'] for call in tool_calls),
+                        )
+                if not announced:
+                    announced = True
+                    yield {
+                        'is_task_complete': False,
+                        'require_user_input': False,
+                        'content': 'Computing...',
+                    }
 
         final_response = self.get_agent_response(config)
-        logger.info(f"🎉 Calculation complete! Answer: {final_response['content']}")
+        logger.info("🎉 Calculation complete! Answer: %s", final_response['content'])
         yield final_response
 
     def get_agent_response(self, config: dict) -> dict:
         logger.info("📊 Preparing final result...")
         current_state = self.graph.get_state(config)
-        logger.info(f"🔄 Current state: Processing complete")
+        logger.info("🔄 Current state: Processing complete")
         
         # Get the last message from the state
         messages = current_state.values.get('messages', [])
@@ -159,22 +272,23 @@ STRICT REQUIREMENTS:
         for msg in reversed(messages):
             if isinstance(msg, ToolMessage) and msg.name == 'calculate':
                 try:
-                    result = eval(msg.content)  # Safe since we know this is our JSON response
+                    # ToolNode serializes the dict returned by calculate as JSON
+                    result = json.loads(msg.content) if isinstance(msg.content, str) else msg.content
                     if 'error' in result:
-                        logger.error(f"⚠️ Calculation error: {result['error']}")
+                        logger.error("⚠️ Calculation error: %s", result['error'])
                         return {
                             'is_task_complete': False,
                             'require_user_input': True,
                             'content': result['error'],
                         }
-                    logger.info(f"✅ Calculation successful!")
+                    logger.info("✅ Calculation successful!")
                     return {
                         'is_task_complete': True,
                         'require_user_input': False,
                         'content': str(result['result']),
                     }
                 except Exception as e:
-                    logger.error(f"❌ Error processing result: {str(e)}")
+                    logger.error("❌ Error processing result: %s", e)
                 break
 
         logger.warning("⚠️ Unable to process calculation request")
@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import traceback
 
 from collections.abc import AsyncIterable
 
@@ -201,8 +200,7 @@ class AgentTaskManager(InMemoryTaskManager):
                 request.id, task_send_params.id, sse_event_queue
             )
         except Exception as e:
-            logger.error(f'Error in SSE stream: {e}')
-            print(traceback.format_exc())
+            logger.exception('Error in SSE stream: %s', e)
             return JSONRPCResponse(
                 id=request.id,
                 error=InternalError(
@@ -13,11 +13,30 @@ class A2ACardResolver:
         self.base_url = base_url.rstrip('/')
         self.agent_card_path = agent_card_path.lstrip('/')
 
+    @property
+    def agent_card_url(self) -> str:
+        return self.base_url + '/' + self.agent_card_path
+
     def get_agent_card(self) -> AgentCard:
         with httpx.Client() as client:
-            response = client.get(self.base_url + '/' + self.agent_card_path)
-            response.raise_for_status()
-            try:
-                return AgentCard(**response.json())
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+            response = client.get(self.agent_card_url)
+            return self._parse(response)
+
+    async def get_agent_card_async(
+        self, httpx_client: httpx.AsyncClient
+    ) -> AgentCard:
+        """Fetches the card without blocking the event loop.
+
+        Using the client that later sends the tasks lets the first task
+        reuse the connection opened for the card.
+        """
+        response = await httpx_client.get(self.agent_card_url)
+        return self._parse(response)
+
+    @staticmethod
+    def _parse(response: httpx.Response) -> AgentCard:
+        response.raise_for_status()
+        try:
+            return AgentCard(**response.json())
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
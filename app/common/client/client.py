@@ -1,12 +1,11 @@
-import json
-
 from collections.abc import AsyncIterable
-from typing import Any
+from typing import Any, TypeVar
 
 import httpx
 
 from httpx._types import TimeoutTypes
-from httpx_sse import connect_sse
+from httpx_sse import aconnect_sse
+from pydantic import ValidationError
 
 from common.types import (
     A2AClientHTTPError,
@@ -19,6 +18,7 @@ from common.types import (
     GetTaskRequest,
     GetTaskResponse,
     JSONRPCRequest,
+    JSONRPCResponse,
     SendTaskRequest,
     SendTaskResponse,
     SendTaskStreamingRequest,
@@ -28,12 +28,34 @@ from common.types import (
 )
 
 
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+ResponseT = TypeVar('ResponseT', bound=JSONRPCResponse)
+
+
+def _parse_response(
+    response_type: type[ResponseT], data: str | bytes
+) -> ResponseT:
+    """Validates a JSON body straight into `response_type`.
+
+    pydantic parses the raw bytes itself, skipping the stdlib decoder and
+    the intermediate dict.
+    """
+    try:
+        return response_type.model_validate_json(data)
+    except ValidationError as e:
+        if any(error['type'] == 'json_invalid' for error in e.errors()):
+            raise A2AClientJSONError(str(e)) from e
+        raise
+
+
 class A2AClient:
     def __init__(
         self,
         agent_card: AgentCard = None,
         url: str = None,
         timeout: TimeoutTypes = 60.0,
+        httpx_client: httpx.AsyncClient | None = None,
     ):
         if agent_card:
             self.url = agent_card.url
@@ -42,61 +64,94 @@ class A2AClient:
         else:
             raise ValueError('Must provide either agent_card or url')
         self.timeout = timeout
+        # When given, requests reuse this client's keep-alive connection pool
+        self.httpx_client = httpx_client
 
     async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
-        return SendTaskResponse(**await self._send_request(request))
+        return _parse_response(
+            SendTaskResponse, await self._send_request(request)
+        )
 
     async def send_task_streaming(
         self, payload: dict[str, Any]
     ) -> AsyncIterable[SendTaskStreamingResponse]:
         request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
-                client, 'POST', self.url, json=request.model_dump()
-            ) as event_source:
-                try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
-                except httpx.RequestError as e:
-                    raise A2AClientHTTPError(400, str(e)) from e
-
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
+        if self.httpx_client is not None:
+            async for response in self._stream(self.httpx_client, request):
+                yield response
+            return
         async with httpx.AsyncClient() as client:
+            async for response in self._stream(client, request):
+                yield response
+
+    async def _stream(
+        self, client: httpx.AsyncClient, request: JSONRPCRequest
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        async with aconnect_sse(
+            client,
+            'POST',
+            self.url,
+            content=request.model_dump_json(),
+            # aconnect_sse adds its own headers to the dict it is given
+            headers=dict(_JSON_HEADERS),
+            # Events may be minutes apart while the agent works
+            timeout=None,
+        ) as event_source:
             try:
-                # Image generation could take time, adding timeout
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+                async for sse in event_source.aiter_sse():
+                    yield _parse_response(SendTaskStreamingResponse, sse.data)
+            except httpx.RequestError as e:
+                raise A2AClientHTTPError(400, str(e)) from e
+
+    async def _send_request(self, request: JSONRPCRequest) -> bytes:
+        if self.httpx_client is not None:
+            return await self._post(self.httpx_client, request)
+        async with httpx.AsyncClient() as client:
+            return await self._post(client, request)
+
+    async def _post(
+        self, client: httpx.AsyncClient, request: JSONRPCRequest
+    ) -> bytes:
+        try:
+            # Image generation could take time, adding timeout
+            response = await client.post(
+                self.url,
+                # pydantic's serializer skips the intermediate dict and the
+                # stdlib json encoder
+                content=request.model_dump_json(),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return response.content
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
 
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
-        return GetTaskResponse(**await self._send_request(request))
+        return _parse_response(
+            GetTaskResponse, await self._send_request(request)
+        )
 
     async def cancel_task(self, payload: dict[str, Any]) -> CancelTaskResponse:
         request = CancelTaskRequest(params=payload)
-        return CancelTaskResponse(**await self._send_request(request))
+        return _parse_response(
+            CancelTaskResponse, await self._send_request(request)
+        )
 
     async def set_task_callback(
         self, payload: dict[str, Any]
     ) -> SetTaskPushNotificationResponse:
         request = SetTaskPushNotificationRequest(params=payload)
-        return SetTaskPushNotificationResponse(
-            **await self._send_request(request)
+        return _parse_response(
+            SetTaskPushNotificationResponse, await self._send_request(request)
         )
 
     async def get_task_callback(
         self, payload: dict[str, Any]
     ) -> GetTaskPushNotificationResponse:
         request = GetTaskPushNotificationRequest(params=payload)
-        return GetTaskPushNotificationResponse(
-            **await self._send_request(request)
+        return _parse_response(
+            GetTaskPushNotificationResponse, await self._send_request(request)
         )
@@ -0,0 +1,20 @@
+"""Event loop selection utility."""
+
+import asyncio
+
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Returns a uvloop event loop when uvloop is installed.
+
+    Falls back to the stock asyncio loop otherwise. uvicorn already picks
+    uvloop on its own; this covers loops the samples create themselves.
+    """
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
@@ -0,0 +1,41 @@
+"""Lazy agent holder utility."""
+
+import threading
+
+from collections.abc import Callable
+from functools import cached_property
+
+
+class LazyAgent:
+    """Defers building an agent until the first attribute access.
+
+    Agent construction sets up LLM clients and orchestration graphs, which
+    is wasted work for processes that never serve a request (``--help``,
+    health checks, idle replicas). Attribute access is forwarded to the
+    agent, so the holder can be passed wherever the agent is expected.
+    """
+
+    def __init__(self, factory: Callable[[], object]):
+        self._factory = factory
+        self._lock = threading.Lock()
+
+    @cached_property
+    def agent(self) -> object:
+        """The wrapped agent, built by the factory on first use."""
+        # cached_property does not lock, and requests served from worker
+        # threads could otherwise build the agent twice
+        with self._lock:
+            if 'agent' not in self.__dict__:
+                self.__dict__['agent'] = self._factory()
+            return self.__dict__['agent']
+
+    def __getattr__(self, name: str) -> object:
+        """Forwards attributes the holder lacks to the wrapped agent."""
+        # An AttributeError raised while building the agent makes Python
+        # retry through __getattr__('agent'); re-reading self.agent here
+        # would recurse until RecursionError
+        if name == 'agent' or name.startswith('__'):
+            raise AttributeError(
+                f'{type(self).__name__!r} object has no attribute {name!r}'
+            )
+        return getattr(self.agent, name)
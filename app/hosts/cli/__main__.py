@@ -1,15 +1,28 @@
 import asyncio
+import sys
 import urllib
 
 from uuid import uuid4
 
 import asyncclick as click
+import httpx
 
 from common.client import A2ACardResolver, A2AClient
 from common.types import TaskState
+from common.utils.event_loop import new_event_loop
 from common.utils.push_notification_auth import PushNotificationReceiverAuth
 
 
+# Stream updates carrying only these keys have nothing worth printing
+_MINIMAL_RESULT_KEYS = frozenset({'id', 'status', 'final'})
+_MINIMAL_STATUS_KEYS = frozenset({'state', 'timestamp', 'message'})
+
+# Constant parts of every task payload; the client validates payloads into
+# new models, so sharing them between requests is safe
+_ACCEPTED_OUTPUT_MODES = ['text']
+_PUSH_AUTHENTICATION = {'schemes': ['bearer']}
+
+
 @click.command()
 @click.option('--agent', default='http://localhost:10002')
 @click.option('--session', default=0)
@@ -23,83 +36,88 @@ async def cli(
     use_push_notifications: bool,
     push_notification_receiver: str,
 ):
-    card_resolver = A2ACardResolver(agent)
-    card = card_resolver.get_agent_card()
+    # One keep-alive pool for the card fetch and every turn of the session
+    async with httpx.AsyncClient() as http_client:
+        card = await A2ACardResolver(agent).get_agent_card_async(http_client)
 
-    print('\n🤖 Successfully connected to AI Agent')
-    print('📋 Available capabilities:')
-    print(card.model_dump_json(exclude_none=True, indent=2))
+        print('\n🤖 Successfully connected to AI Agent')
+        print('📋 Available capabilities:')
+        print(card.model_dump_json(exclude_none=True, indent=2))
 
-    notif_receiver_parsed = urllib.parse.urlparse(push_notification_receiver)
-    notification_receiver_host = notif_receiver_parsed.hostname
-    notification_receiver_port = notif_receiver_parsed.port
+        notif_receiver_parsed = urllib.parse.urlparse(push_notification_receiver)
+        notification_receiver_host = notif_receiver_parsed.hostname
+        notification_receiver_port = notif_receiver_parsed.port
 
-    if use_push_notifications:
-        from hosts.cli.push_notification_listener import (
-            PushNotificationListener,
-        )
+        if use_push_notifications:
+            from hosts.cli.push_notification_listener import (
+                PushNotificationListener,
+            )
 
-        notification_receiver_auth = PushNotificationReceiverAuth()
-        await notification_receiver_auth.load_jwks(
-            f'{agent}/.well-known/jwks.json'
-        )
+            notification_receiver_auth = PushNotificationReceiverAuth()
+            await notification_receiver_auth.load_jwks(
+                f'{agent}/.well-known/jwks.json'
+            )
 
-        push_notification_listener = PushNotificationListener(
-            host=notification_receiver_host,
-            port=notification_receiver_port,
-            notification_receiver_auth=notification_receiver_auth,
-        )
-        push_notification_listener.start()
-
-    client = A2AClient(agent_card=card, timeout=300.0)  # 5 minutes timeout
-    if session == 0:
-        sessionId = uuid4().hex
-    else:
-        sessionId = session
-
-    continue_loop = True
-    streaming = card.capabilities.streaming
-
-    while continue_loop:
-        taskId = uuid4().hex
-        print('\n🔄 Starting a new conversation')
-        continue_loop = await completeTask(
-            client,
-            streaming,
-            use_push_notifications,
-            notification_receiver_host,
-            notification_receiver_port,
-            taskId,
-            sessionId,
+            push_notification_listener = PushNotificationListener(
+                host=notification_receiver_host,
+                port=notification_receiver_port,
+                notification_receiver_auth=notification_receiver_auth,
+            )
+            push_notification_listener.start()
+
+        client = A2AClient(
+            agent_card=card, timeout=300.0, httpx_client=http_client
+        )  # 5 minutes timeout
+        if session == 0:
+            sessionId = uuid4().hex
+        else:
+            sessionId = session
+
+        continue_loop = True
+        streaming = card.capabilities.streaming
+        notify_url = (
+            f'http://{notification_receiver_host}:{notification_receiver_port}/notify'
+            if use_push_notifications
+            else None
         )
 
-        if history and continue_loop:
-            print('\n📜 Conversation History:')
-            task_response = await client.get_task(
-                {'id': taskId, 'historyLength': 10}
-            )
-            print(
-                task_response.model_dump_json(
-                    include={'result': {'history': True}}
-                )
+        while continue_loop:
+            taskId = uuid4().hex
+            print('\n🔄 Starting a new conversation')
+            continue_loop = await completeTask(
+                client,
+                streaming,
+                notify_url,
+                taskId,
+                sessionId,
             )
 
+            if history and continue_loop:
+                print('\n📜 Conversation History:')
+                task_response = await client.get_task(
+                    {'id': taskId, 'historyLength': 10}
+                )
+                print(
+                    task_response.model_dump_json(
+                        include={'result': {'history': True}}
+                    )
+                )
 
 def to_dict(obj):
-    """Convert an object to a dict if possible."""
+    """Convert an object to a dict if possible, omitting None fields."""
     if isinstance(obj, dict):
         return obj
     if hasattr(obj, 'model_dump') and callable(obj.model_dump):
-        return obj.model_dump()
+        return obj.model_dump(exclude_none=True)
     if hasattr(obj, '__dict__'):
         return obj.__dict__
     return {}
 
 
 def print_parts(parts):
+    """Print the text of each part on its own line with a single write."""
     if parts:
-        for part in parts:
-            print(part.text)
+        sys.stdout.write('\n'.join(part.text for part in parts) + '\n')
         return True
     return False
 
@@ -107,116 +125,116 @@ def print_parts(parts):
 async def completeTask(
     client: A2AClient,
     streaming,
-    use_push_notifications: bool,
-    notification_receiver_host: str,
-    notification_receiver_port: int,
+    notify_url: str | None,
     taskId,
     sessionId,
 ):
-    prompt = click.prompt(
-        '\nWhat do you want to send to the agent? (:q or quit to exit)'
+    push_notification = (
+        {'url': notify_url, 'authentication': _PUSH_AUTHENTICATION}
+        if notify_url is not None
+        else None
     )
-    if prompt == ':q' or prompt == 'quit':
-        return False
-
-    message = {
-        'role': 'user',
-        'parts': [
-            {
-                'type': 'text',
-                'text': prompt,
-            }
-        ],
-    }
-
-    payload = {
-        'id': taskId,
-        'sessionId': sessionId,
-        'acceptedOutputModes': ['text'],
-        'message': message,
-    }
-
-    if use_push_notifications:
-        payload['pushNotification'] = {
-            'url': f'http://{notification_receiver_host}:{notification_receiver_port}/notify',
-            'authentication': {
-                'schemes': ['bearer'],
-            },
+    # Keep prompting for the same task while the agent needs more input
+    while True:
+        prompt = click.prompt(
+            '\nWhat do you want to send to the agent? (:q or quit to exit)'
+        )
+        if prompt == ':q' or prompt == 'quit':
+            return False
+
+        message = {
+            'role': 'user',
+            'parts': [
+                {
+                    'type': 'text',
+                    'text': prompt,
+                }
+            ],
         }
 
-    taskResult = None
-    if streaming:
-        response_stream = client.send_task_streaming(payload)
-        async for result in response_stream:
-            status = getattr(result.result, 'status', None)
-            message = getattr(status, 'message', None) if status else None
-            parts = getattr(message, 'parts', None) if message else None
-            if parts:
-                for part in parts: print(part.text)
-                continue
-            artifact = getattr(result.result, 'artifact', None)
-            artifact_parts = getattr(artifact, 'parts', None) if artifact else None
-            if artifact_parts:
-                for part in artifact_parts: print(part.text)
-                continue
-            result_dict = to_dict(result.result)
-            status_dict = to_dict(result_dict.get('status', {}))
-            # Remove keys with value None for minimality check
-            minimal_result_keys = {k for k, v in result_dict.items() if v is not None}
-            # Allow 'message' in status_dict, as it may be present and None
-            if minimal_result_keys.issubset({'id', 'status', 'final'}) \
-                and set(status_dict.keys()).issubset({'state', 'timestamp', 'message'}):
-                continue
-            print(f'\n🔄 Stream update: {result.model_dump_json(exclude_none=True, indent=2)}')
-
-        taskResult = await client.get_task({'id': taskId})
-    else:
-        # Display thinking animation
-        print('\n🤔 AI Agent is thinking...')
-        taskResult = await client.send_task(payload)
-        # Clear thinking message
-        print('\r' + ' ' * 30, end='')
+        payload = {
+            'id': taskId,
+            'sessionId': sessionId,
+            'acceptedOutputModes': _ACCEPTED_OUTPUT_MODES,
+            'message': message,
+        }
+
+        if push_notification is not None:
+            payload['pushNotification'] = push_notification
+
+        state = None
+        if streaming:
+            response_stream = client.send_task_streaming(payload)
+            async for result in response_stream:
+                # Status events carry status.message, artifact events carry
+                # artifact; a missing link in either chain means no parts
+                status = getattr(result.result, 'status', None)
+                if status is not None:
+                    # The last status event holds the task's final state, so
+                    # no get_task round trip is needed once the stream ends
+                    state = status.state
+                try:
+                    parts = status.message.parts
+                except AttributeError:
+                    parts = None
+                if print_parts(parts):
+                    continue
+                try:
+                    artifact_parts = result.result.artifact.parts
+                except AttributeError:
+                    artifact_parts = None
+                if print_parts(artifact_parts):
+                    continue
+                # model_dump already turned the nested status into a dict
+                result_dict = to_dict(result.result)
+                status_dict = result_dict.get('status') or {}
+                # to_dict drops None values, so only set keys are compared
+                if result_dict.keys() <= _MINIMAL_RESULT_KEYS \
+                    and status_dict.keys() <= _MINIMAL_STATUS_KEYS:
+                    continue
+                print(f'\n🔄 Stream update: {result.model_dump_json(exclude_none=True, indent=2)}')
+        else:
+            # Display thinking animation
+            print('\n🤔 AI Agent is thinking...')
+            taskResult = await client.send_task(payload)
+            # Clear thinking message
+            print('\r' + ' ' * 30, end='')
         
-        try:
-            # First try to get text from status message
-            if hasattr(taskResult.result.status, 'message') and taskResult.result.status.message:
-                full_text = ""
-                for part in taskResult.result.status.message.parts:
-                    if hasattr(part, 'text'):
-                        full_text += part.text
-                if full_text:
-                    print(full_text)
+            try:
+                # First try to get text from status message
+                message = taskResult.result.status.message
+                if message:
+                    full_text = ''.join(
+                        part.text for part in message.parts if part.type == 'text'
+                    )
+                    if full_text:
+                        print(full_text)
+                        return True
+
+                # Then try to get text from artifacts
+                artifacts = taskResult.result.artifacts
+                if artifacts:
+                    sys.stdout.write(''.join(
+                        part.text + '\n'
+                        for artifact in artifacts
+                        for part in artifact.parts
+                        if part.type == 'text'
+                    ))
                     return True
 
-            # Then try to get text from artifacts
-            if hasattr(taskResult.result, 'artifacts') and taskResult.result.artifacts:
-                for artifact in taskResult.result.artifacts:
-                    if hasattr(artifact, 'parts'):
-                        for part in artifact.parts:
-                            if hasattr(part, 'text'):
-                                print(part.text)
-                return True
-
-            # If no text content found, fall back to printing full JSON
-            print(f'\n{taskResult.model_dump_json(exclude_none=True)}')
-        except Exception as e:
-            print(f'\n{taskResult.model_dump_json(exclude_none=True)}')
-
-    ## if the result is that more input is required, loop again.
-    state = TaskState(taskResult.result.status.state)
-    if state.name == TaskState.INPUT_REQUIRED.name:
-        return await completeTask(
-            client,
-            streaming,
-            use_push_notifications,
-            notification_receiver_host,
-            notification_receiver_port,
-            taskId,
-            sessionId,
-        )
-    ## task is complete
-    return True
+                # If no text content found, fall back to printing full JSON
+                print(f'\n{taskResult.model_dump_json(exclude_none=True)}')
+            except Exception as e:
+                print(f'\n{taskResult.model_dump_json(exclude_none=True)}')
+            state = taskResult.result.status.state
+
+        ## if the result is that more input is required, loop again.
+        # TaskStatus validates state into a TaskState member already
+        if state is not TaskState.INPUT_REQUIRED:
+            ## task is complete
+            return True
 
 
 if __name__ == '__main__':
-    asyncio.run(cli())
+    with asyncio.Runner(loop_factory=new_event_loop) as runner:
+        runner.run(cli())